@@ -1,3 +1,6 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
@@ -7,6 +10,14 @@ class MicroservicioPrediccionConfig(AppConfig):
     verbose_name = 'Microservicio de Predicción Académica'
     
     def ready(self):
-        """Inicialización cuando la app esté lista"""
-        # Aquí se puede cargar el modelo ML automáticamente si es necesario
-        pass 
\ No newline at end of file
+        """Inicialización cuando la app esté lista: precarga el modelo ML"""
+        # Con el autoreloader de runserver solo el proceso hijo (RUN_MAIN) atiende peticiones
+        if (
+            'runserver' in sys.argv
+            and '--noreload' not in sys.argv
+            and os.environ.get('RUN_MAIN') != 'true'
+        ):
+            return
+        
+        from .services import modelo_service
+        modelo_service.cargar_modelo() 
\ No newline at end of file
@@ -2,8 +2,10 @@
 Modelos/Esquemas Pydantic - Similar a models.py de Django
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+from .settings import BATCH_MAX_SIZE
 
 
 class EstudianteRequest(BaseModel):
@@ -53,25 +55,32 @@ class EstudianteRequest(BaseModel):
         description="Porcentaje de asistencia del segundo trimestre (0-100)"
     )
 
-    @validator("*", pre=True)
-    def validar_numeros(cls, value):
-        """Valida que todos los valores sean números válidos"""
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            raise ValueError("Todos los valores deben ser números válidos")
+
+class LotePrediccionRequest(BaseModel):
+    """Esquema para datos de entrada de una predicción por lotes"""
+    
+    estudiantes: List[EstudianteRequest] = Field(
+        ...,
+        min_length=1, max_length=BATCH_MAX_SIZE,
+        description=f"Estudiantes a predecir (1-{BATCH_MAX_SIZE})"
+    )
 
 
 class PrediccionResponse(BaseModel):
-    """Esquema para respuesta de predicción"""
+    """
+    Esquema para respuesta de predicción
+    
+    El servicio la construye con model_construct (sin validar): los Literal
+    documentan los valores posibles en el esquema, no se comprueban en runtime.
+    """
     
     nota_estimada: float = Field(
         description="Nota estimada para el tercer trimestre (0-100)"
     )
-    clasificacion: str = Field(
+    clasificacion: Literal["bajo", "medio", "alto"] = Field(
         description="Clasificación del rendimiento: 'bajo', 'medio' o 'alto'"
     )
-    nivel_confianza: str = Field(
+    nivel_confianza: Literal["bajo", "medio", "alto"] = Field(
         description="Nivel de confianza: 'bajo', 'medio' o 'alto'"
     )
     confianza_valor: float = Field(
@@ -2,10 +2,47 @@
 Serializers - Validación y transformación de datos (similar a Django serializers)
 """
 
+import bisect
+import threading
 import numpy as np
+from pydantic import TypeAdapter
 from typing import Dict, Any, List
-from .models import EstudianteRequest, PrediccionResponse
-from .settings import FEATURE_COLUMNS, THRESHOLD_LOW, THRESHOLD_HIGH, TARGET_COLUMN
+from .models import EstudianteRequest, LotePrediccionRequest, PrediccionResponse
+from .settings import (
+    FEATURE_COLUMNS, TARGET_COLUMN,
+    NOTA_THRESHOLDS, NOTA_LABELS, CONFIANZA_THRESHOLDS, CONFIANZA_LABELS
+)
+
+# Validador de entrada compilado una sola vez
+_ESTUDIANTE_ADAPTER = TypeAdapter(EstudianteRequest)
+_LOTE_ADAPTER = TypeAdapter(LotePrediccionRequest)
+
+# Buffers de características reutilizables (uno por hilo)
+_buffers = threading.local()
+
+# Índice de cada nivel en las tablas de textos
+_ORDEN_NIVELES = {"alto": 0, "medio": 1, "bajo": 2}
+
+# Mensajes base por clasificación, en el orden de _ORDEN_NIVELES
+_MENSAJES_BASE = (
+    "Excelente trabajo! Se estima una nota de {nota:.1f} (rendimiento alto)",
+    "Buen rendimiento. Se estima una nota de {nota:.1f} (rendimiento medio)",
+    "Hay oportunidades de mejora. Se estima una nota de {nota:.1f} (rendimiento bajo)",
+)
+
+# Texto por nivel de confianza, en el orden de _ORDEN_NIVELES
+_CONFIANZA_TEXTO = (
+    "con alta confianza",
+    "con confianza moderada",
+    "con baja confianza",
+)
+
+# Plantilla completa por (clasificación, confianza): un solo format por mensaje
+_MENSAJES = {
+    (clasificacion, confianza): f"{_MENSAJES_BASE[i]} {_CONFIANZA_TEXTO[j]}."
+    for clasificacion, i in _ORDEN_NIVELES.items()
+    for confianza, j in _ORDEN_NIVELES.items()
+}
 
 
 class EstudianteSerializer:
@@ -26,7 +63,45 @@ class EstudianteSerializer:
             ValueError: Si los datos no son válidos
         """
         try:
-            return EstudianteRequest(**data)
+            return _ESTUDIANTE_ADAPTER.validate_python(data)
+        except Exception as e:
+            raise ValueError(f"Datos inválidos: {str(e)}")
+    
+    @staticmethod
+    def validar_json(body: bytes) -> EstudianteRequest:
+        """
+        Valida los datos del estudiante directamente desde el cuerpo JSON
+        
+        Args:
+            body: Cuerpo crudo de la petición (JSON)
+            
+        Returns:
+            EstudianteRequest: Objeto validado
+            
+        Raises:
+            ValueError: Si el JSON o los datos no son válidos
+        """
+        try:
+            return _ESTUDIANTE_ADAPTER.validate_json(body)
+        except Exception as e:
+            raise ValueError(f"Datos inválidos: {str(e)}")
+    
+    @staticmethod
+    def validar_lote_json(body: bytes) -> List[EstudianteRequest]:
+        """
+        Valida un lote de estudiantes directamente desde el cuerpo JSON
+        
+        Args:
+            body: Cuerpo crudo de la petición (JSON con la clave "estudiantes")
+            
+        Returns:
+            List[EstudianteRequest]: Estudiantes validados
+            
+        Raises:
+            ValueError: Si el JSON o los datos no son válidos
+        """
+        try:
+            return _LOTE_ADAPTER.validate_json(body).estudiantes
         except Exception as e:
             raise ValueError(f"Datos inválidos: {str(e)}")
     
@@ -35,23 +110,45 @@ class EstudianteSerializer:
         """
         Convierte los datos del estudiante a array para el modelo
         
+        El array se reutiliza entre llamadas del mismo hilo: su contenido
+        solo es válido hasta la siguiente llamada.
+        
         Args:
             estudiante: Datos validados del estudiante
             
         Returns:
-            np.ndarray: Array con las características en el orden correcto
-        """
-        features = [
-            estudiante.prom_tareas_t1,
-            estudiante.prom_examenes_t1,
-            estudiante.prom_part_t1,
-            estudiante.asistencia_t1,
-            estudiante.prom_tareas_t2,
-            estudiante.prom_examenes_t2,
-            estudiante.prom_part_t2,
-            estudiante.asistencia_t2
-        ]
-        return np.array(features).reshape(1, -1)
+            np.ndarray: Array (1, n_features) float32 en el orden correcto
+        """
+        features = getattr(_buffers, 'features', None)
+        if features is None:
+            features = np.empty((1, len(FEATURE_COLUMNS)), dtype=np.float32)
+            _buffers.features = features
+        
+        features[0, 0] = estudiante.prom_tareas_t1
+        features[0, 1] = estudiante.prom_examenes_t1
+        features[0, 2] = estudiante.prom_part_t1
+        features[0, 3] = estudiante.asistencia_t1
+        features[0, 4] = estudiante.prom_tareas_t2
+        features[0, 5] = estudiante.prom_examenes_t2
+        features[0, 6] = estudiante.prom_part_t2
+        features[0, 7] = estudiante.asistencia_t2
+        return features
+    
+    @staticmethod
+    def to_features_matrix(estudiantes: List[EstudianteRequest]) -> np.ndarray:
+        """
+        Convierte un lote de estudiantes a matriz para el modelo
+        
+        Args:
+            estudiantes: Datos validados de los estudiantes
+            
+        Returns:
+            np.ndarray: Matriz (n_estudiantes, n_features) float32
+        """
+        return np.array(
+            [[getattr(estudiante, col) for col in FEATURE_COLUMNS] for estudiante in estudiantes],
+            dtype=np.float32
+        )
     
     @staticmethod
     def get_feature_names() -> List[str]:
@@ -73,12 +170,8 @@ class PrediccionSerializer:
         Returns:
             str: Clasificación ('bajo', 'medio', 'alto')
         """
-        if nota < THRESHOLD_LOW:
-            return "bajo"
-        elif nota < THRESHOLD_HIGH:
-            return "medio"
-        else:
-            return "alto"
+        # nota < LOW -> 0, LOW <= nota < HIGH -> 1, nota >= HIGH -> 2
+        return NOTA_LABELS[bisect.bisect_right(NOTA_THRESHOLDS, nota)]
     
     @staticmethod
     def evaluar_confianza(diferencia_std: float) -> str:
@@ -91,14 +184,8 @@ class PrediccionSerializer:
         Returns:
             str: Nivel de confianza ('alto', 'medio', 'bajo')
         """
-        from .settings import CONFIDENCE_HIGH_THRESHOLD, CONFIDENCE_MEDIUM_THRESHOLD
-        
-        if diferencia_std <= CONFIDENCE_HIGH_THRESHOLD:
-            return "alto"
-        elif diferencia_std <= CONFIDENCE_MEDIUM_THRESHOLD:
-            return "medio"
-        else:
-            return "bajo"
+        # std <= HIGH -> 0, HIGH < std <= MEDIUM -> 1, std > MEDIUM -> 2
+        return CONFIANZA_LABELS[bisect.bisect_left(CONFIANZA_THRESHOLDS, diferencia_std)]
     
     @staticmethod
     def generar_mensaje(nota: float, clasificacion: str, confianza: str) -> str:
@@ -113,20 +200,17 @@ class PrediccionSerializer:
         Returns:
             str: Mensaje descriptivo
         """
-        mensajes_base = {
-            "alto": f"Excelente trabajo! Se estima una nota de {nota:.1f} (rendimiento alto)",
-            "medio": f"Buen rendimiento. Se estima una nota de {nota:.1f} (rendimiento medio)",
-            "bajo": f"Hay oportunidades de mejora. Se estima una nota de {nota:.1f} (rendimiento bajo)"
-        }
+        plantilla = _MENSAJES.get((clasificacion, confianza))
+        if plantilla is not None:
+            return plantilla.format(nota=nota)
         
-        confianza_texto = {
-            "alto": "con alta confianza",
-            "medio": "con confianza moderada", 
-            "bajo": "con baja confianza"
-        }
+        # Niveles desconocidos: componer el mensaje por partes
+        indice = _ORDEN_NIVELES.get(clasificacion)
+        plantilla = _MENSAJES_BASE[indice] if indice is not None else "Se estima una nota de {nota:.1f}"
+        mensaje_base = plantilla.format(nota=nota)
         
-        mensaje_base = mensajes_base.get(clasificacion, f"Se estima una nota de {nota:.1f}")
-        nivel_confianza = confianza_texto.get(confianza, "")
+        indice = _ORDEN_NIVELES.get(confianza)
+        nivel_confianza = _CONFIANZA_TEXTO[indice] if indice is not None else ""
         
         return f"{mensaje_base} {nivel_confianza}."
     
@@ -147,9 +231,48 @@ class PrediccionSerializer:
         """
         clasificacion = PrediccionSerializer.clasificar_nota(nota)
         nivel_confianza = PrediccionSerializer.evaluar_confianza(diferencia_std)
+        return PrediccionSerializer._construir_respuesta(
+            nota, diferencia_std, clasificacion, nivel_confianza
+        )
+    
+    @staticmethod
+    def create_responses(
+        notas: np.ndarray, 
+        diferencias_std: np.ndarray
+    ) -> List[PrediccionResponse]:
+        """
+        Crea las respuestas de un lote, clasificando todas las notas a la vez
+        
+        Args:
+            notas: Notas estimadas
+            diferencias_std: Diferencias estándar
+            
+        Returns:
+            List[PrediccionResponse]: Respuestas en el mismo orden
+        """
+        # Mismos cortes que bisect_right / bisect_left en la versión individual
+        clases = np.searchsorted(NOTA_THRESHOLDS, notas, side='right')
+        confianzas = np.searchsorted(CONFIANZA_THRESHOLDS, diferencias_std, side='left')
+        
+        return [
+            PrediccionSerializer._construir_respuesta(
+                float(nota), float(std), NOTA_LABELS[clase], CONFIANZA_LABELS[confianza]
+            )
+            for nota, std, clase, confianza in zip(notas, diferencias_std, clases, confianzas)
+        ]
+    
+    @staticmethod
+    def _construir_respuesta(
+        nota: float,
+        diferencia_std: float,
+        clasificacion: str,
+        nivel_confianza: str
+    ) -> PrediccionResponse:
+        """Construye la respuesta a partir de los niveles ya calculados"""
         mensaje = PrediccionSerializer.generar_mensaje(nota, clasificacion, nivel_confianza)
         
-        return PrediccionResponse(
+        # Valores generados internamente: se construye sin revalidar
+        return PrediccionResponse.model_construct(
             nota_estimada=round(nota, 2),
             clasificacion=clasificacion,
             nivel_confianza=nivel_confianza,
@@ -199,11 +322,12 @@ class DatasetSerializer:
         # Eliminar filas con valores nulos
         df_clean = df.dropna()
         
-        # Validar rangos de valores
-        for col in FEATURE_COLUMNS + [TARGET_COLUMN]:
-            if col in df_clean.columns:
-                df_clean = df_clean[
-                    (df_clean[col] >= 0) & (df_clean[col] <= 100)
-                ]
+        # Validar rangos de valores con una sola máscara sobre todas las columnas
+        columnas = [
+            col for col in FEATURE_COLUMNS + [TARGET_COLUMN]
+            if col in df_clean.columns
+        ]
+        valores = df_clean[columnas].to_numpy()
+        mascara = ((valores >= 0) & (valores <= 100)).all(axis=1)
         
-        return df_clean 
\ No newline at end of file
+        return df_clean.loc[mascara] 
\ No newline at end of file
@@ -2,35 +2,194 @@
 Services - Lógica de negocio para ML (similar a servicios en Django)
 """
 
+import math
 import pickle
+import threading
+from functools import lru_cache
+import joblib
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 import logging
 
+try:
+    from numba import njit
+except ImportError:  # numba es opcional: sin él se usa la versión NumPy
+    njit = None
+
 from .models import EstudianteRequest, PrediccionResponse
 from .serializers import EstudianteSerializer, PrediccionSerializer, DatasetSerializer
 from .settings import (
     MODEL_PATH, DATASET_PATH, MODEL_CONFIG, 
-    FEATURE_COLUMNS, TARGET_COLUMN
+    FEATURE_COLUMNS, TARGET_COLUMN,
+    PREDICTION_CACHE_SIZE
 )
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Caché de verificar_dataset: (mtime_ns, tamaño, resultado) del último CSV leído
+_dataset_cache: Optional[Tuple[int, int, Dict[str, Any]]] = None
+
+
+def _media_std(predicciones: np.ndarray) -> Tuple[float, float]:
+    """Media y desviación estándar poblacional de las predicciones de los árboles"""
+    media = predicciones.mean()
+    desvio = predicciones - media
+    return float(media), math.sqrt(desvio.dot(desvio) / predicciones.shape[0])
+
+
+def _recorrer_muestra(x, raices, feature, umbral, izquierdo, derecho, valor):
+    """
+    Recorre cada árbol hasta su hoja para una muestra y devuelve media y
+    desviación estándar de sus predicciones, sin arreglos intermedios de NumPy
+    """
+    n_arboles = raices.shape[0]
+    predicciones = np.empty(n_arboles)
+    suma = 0.0
+    for t in range(n_arboles):
+        nodo = raices[t]
+        # Las hojas apuntan a sí mismas
+        while izquierdo[nodo] != nodo:
+            if x[feature[nodo]] <= umbral[nodo]:
+                nodo = izquierdo[nodo]
+            else:
+                nodo = derecho[nodo]
+        predicciones[t] = valor[nodo]
+        suma += valor[nodo]
+    
+    media = suma / n_arboles
+    acumulado = 0.0
+    for t in range(n_arboles):
+        desvio = predicciones[t] - media
+        acumulado += desvio * desvio
+    return media, math.sqrt(acumulado / n_arboles)
+
+
+# Versión compilada del recorrido cuando numba está instalado. Sin cache=True:
+# la caché en disco escribiría junto al paquete, que puede ser de solo lectura
+_recorrer_muestra_jit = (
+    njit(fastmath=True)(_recorrer_muestra) if njit is not None else None
+)
+
+
+class BosqueCompilado:
+    """
+    Random Forest aplanado en arreglos NumPy para evaluar todos sus árboles a la vez
+    
+    Los nodos de todos los árboles se concatenan en arreglos planos y cada hoja
+    apunta a sí misma, así que avanzar `profundidad` niveles lleva a cada árbol
+    hasta su hoja con unas pocas operaciones vectorizadas, en lugar de una
+    llamada a sklearn por árbol.
+    """
+    
+    def __init__(self, modelo: RandomForestRegressor):
+        arboles = [estimador.tree_ for estimador in modelo.estimators_]
+        tamanos = np.array([arbol.node_count for arbol in arboles])
+        self.raices = np.concatenate(([0], np.cumsum(tamanos)[:-1]))
+        self.n_arboles = len(arboles)
+        self.profundidad = max(arbol.max_depth for arbol in arboles)
+        
+        izquierdos, derechos, features, umbrales, valores = [], [], [], [], []
+        for raiz, arbol in zip(self.raices, arboles):
+            nodos = np.arange(arbol.node_count)
+            es_hoja = arbol.children_left == -1
+            izquierdos.append(np.where(es_hoja, nodos, arbol.children_left) + raiz)
+            derechos.append(np.where(es_hoja, nodos, arbol.children_right) + raiz)
+            features.append(np.where(es_hoja, 0, arbol.feature))
+            umbrales.append(arbol.threshold)
+            valores.append(arbol.value[:, 0, 0])
+        
+        self.izquierdo = np.concatenate(izquierdos)
+        self.derecho = np.concatenate(derechos)
+        self.feature = np.concatenate(features)
+        self.umbral = np.concatenate(umbrales)
+        self.valor = np.concatenate(valores)
+    
+    def predecir_arboles(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predicción de cada árbol para cada muestra
+        
+        Args:
+            X: Características, forma (n_muestras, n_features)
+            
+        Returns:
+            np.ndarray: Predicciones, forma (n_muestras, n_arboles)
+        """
+        # sklearn compara las características en float32
+        X = np.asarray(X, dtype=np.float32)
+        filas = np.arange(X.shape[0])[:, None]
+        nodos = np.broadcast_to(self.raices, (X.shape[0], self.n_arboles))
+        
+        for _ in range(self.profundidad):
+            va_izquierda = X[filas, self.feature[nodos]] <= self.umbral[nodos]
+            nodos = np.where(va_izquierda, self.izquierdo[nodos], self.derecho[nodos])
+        
+        return self.valor[nodos]
+    
+    def predecir_muestra(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predicción de cada árbol para una sola muestra
+        
+        Variante 1D de predecir_arboles: evita la indexación 2D por filas,
+        que domina el coste cuando solo hay una muestra.
+        
+        Args:
+            x: Características de la muestra, forma (n_features,)
+            
+        Returns:
+            np.ndarray: Predicciones contiguas, forma (n_arboles,)
+        """
+        x = np.asarray(x, dtype=np.float32)
+        nodos = self.raices
+        
+        for _ in range(self.profundidad):
+            va_izquierda = x[self.feature[nodos]] <= self.umbral[nodos]
+            nodos = np.where(va_izquierda, self.izquierdo[nodos], self.derecho[nodos])
+        
+        return self.valor[nodos]
+    
+    def media_std_muestra(self, x) -> Tuple[float, float]:
+        """
+        Media y desviación estándar de los árboles para una sola muestra
+        
+        Con numba recorre los árboles en código compilado; sin él usa
+        predecir_muestra.
+        
+        Args:
+            x: Características de la muestra, forma (n_features,)
+            
+        Returns:
+            Tuple[float, float]: Media y desviación estándar de los árboles
+        """
+        if _recorrer_muestra_jit is not None:
+            return _recorrer_muestra_jit(
+                np.asarray(x, dtype=np.float32), self.raices, self.feature,
+                self.umbral, self.izquierdo, self.derecho, self.valor
+            )
+        return _media_std(self.predecir_muestra(x))
+
 
 class ModeloService:
     """Servicio para manejo del modelo de Machine Learning"""
     
     def __init__(self):
         self.modelo: Optional[RandomForestRegressor] = None
+        self._bosque: Optional[BosqueCompilado] = None
         self.is_loaded = False
         self.feature_names = FEATURE_COLUMNS
+        self._load_lock = threading.Lock()
+        # Versión del bosque activo: forma parte de la clave de la caché
+        self._version_modelo = 0
+        # Caché LRU de predicciones por (versión del modelo, características float32)
+        self._predecir_cacheado = lru_cache(maxsize=PREDICTION_CACHE_SIZE)(
+            self._evaluar_bosque
+        )
         
     def cargar_modelo(self) -> bool:
         """
@@ -41,8 +200,8 @@ class ModeloService:
         """
         try:
             if MODEL_PATH.exists():
-                with open(MODEL_PATH, 'rb') as f:
-                    self.modelo = pickle.load(f)
+                self.modelo = joblib.load(MODEL_PATH)
+                self._compilar_bosque()
                 self.is_loaded = True
                 logger.info(f"Modelo cargado desde {MODEL_PATH}")
                 return True
@@ -54,6 +213,20 @@ class ModeloService:
             self.is_loaded = False
             return False
     
+    def _compilar_bosque(self) -> None:
+        """Compila el modelo actual para inferencia e invalida la caché"""
+        bosque = BosqueCompilado(self.modelo)
+        if _recorrer_muestra_jit is not None:
+            # Compilar el kernel de numba aquí y no en la primera petición, con
+            # una muestra de solo lectura como las que produce _evaluar_bosque
+            muestra = bytes(np.dtype(np.float32).itemsize * self.modelo.n_features_in_)
+            bosque.media_std_muestra(np.frombuffer(muestra, dtype=np.float32))
+        self._bosque = bosque
+        # Cambiar de versión después de publicar el bosque: una petición en curso
+        # con el modelo anterior solo puede guardar entradas de la versión vieja
+        self._version_modelo += 1
+        self._predecir_cacheado.cache_clear()
+    
     def guardar_modelo(self) -> bool:
         """
         Guarda el modelo en archivo
@@ -65,8 +238,10 @@ class ModeloService:
             # Crear directorio si no existe
             MODEL_PATH.parent.mkdir(exist_ok=True)
             
-            with open(MODEL_PATH, 'wb') as f:
-                pickle.dump(self.modelo, f)
+            joblib.dump(
+                self.modelo, MODEL_PATH,
+                compress=0, protocol=pickle.HIGHEST_PROTOCOL
+            )
             logger.info(f"Modelo guardado en {MODEL_PATH}")
             return True
         except Exception as e:
@@ -94,8 +269,8 @@ class ModeloService:
             DatasetSerializer.validar_columnas(df)
             df = DatasetSerializer.limpiar_datos(df)
             
-            # Preparar características y objetivo
-            X = df[FEATURE_COLUMNS]
+            # Preparar características (float32, el dtype interno de los árboles) y objetivo
+            X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
             y = df[TARGET_COLUMN]
             
             # Dividir datos
@@ -106,6 +281,7 @@ class ModeloService:
             # Crear y entrenar modelo
             self.modelo = RandomForestRegressor(**MODEL_CONFIG)
             self.modelo.fit(X_train, y_train)
+            self._compilar_bosque()
             
             # Evaluar modelo
             y_pred = self.modelo.predict(X_test)
@@ -133,6 +309,20 @@ class ModeloService:
             logger.error(f"Error entrenando modelo: {e}")
             raise ValueError(f"Error en entrenamiento: {str(e)}")
     
+    def _asegurar_modelo(self) -> None:
+        """
+        Carga el modelo si aún no está disponible
+        
+        Raises:
+            ValueError: Si no hay modelo que cargar
+        """
+        if not self.is_loaded or self.modelo is None:
+            # Intentar cargar modelo una sola vez aunque lleguen peticiones concurrentes
+            with self._load_lock:
+                if not self.is_loaded or self.modelo is None:
+                    if not self.cargar_modelo():
+                        raise ValueError("Modelo no disponible. Debe entrenar primero.")
+    
     def predecir(self, estudiante: EstudianteRequest) -> PrediccionResponse:
         """
         Realiza predicción para un estudiante
@@ -146,24 +336,14 @@ class ModeloService:
         Raises:
             ValueError: Si el modelo no está cargado o hay error en predicción
         """
-        if not self.is_loaded or self.modelo is None:
-            # Intentar cargar modelo
-            if not self.cargar_modelo():
-                raise ValueError("Modelo no disponible. Debe entrenar primero.")
+        self._asegurar_modelo()
         
         try:
-            # Convertir datos a array
+            # Convertir datos a array; la clave de la caché son sus bytes exactos
             features = EstudianteSerializer.to_features_array(estudiante)
-            
-            # Realizar predicción
-            prediccion = self.modelo.predict(features)[0]
-            
-            # Calcular confianza usando desviación estándar de los estimadores
-            predicciones_arboles = [
-                arbol.predict(features)[0] 
-                for arbol in self.modelo.estimators_
-            ]
-            std_prediccion = np.std(predicciones_arboles)
+            prediccion, std_prediccion = self._predecir_cacheado(
+                self._version_modelo, features.tobytes()
+            )
             
             # Crear respuesta
             response = PrediccionSerializer.create_response(
@@ -178,6 +358,55 @@ class ModeloService:
             logger.error(f"Error en predicción: {e}")
             raise ValueError(f"Error realizando predicción: {str(e)}")
     
+    def predecir_batch(self, estudiantes: List[EstudianteRequest]) -> List[PrediccionResponse]:
+        """
+        Realiza predicciones para un lote de estudiantes en una sola pasada
+        
+        Args:
+            estudiantes: Datos de los estudiantes
+            
+        Returns:
+            List[PrediccionResponse]: Predicciones en el mismo orden
+            
+        Raises:
+            ValueError: Si el modelo no está cargado o hay error en predicción
+        """
+        self._asegurar_modelo()
+        
+        try:
+            X = EstudianteSerializer.to_features_matrix(estudiantes)
+            
+            # Todos los árboles para todas las muestras a la vez
+            predicciones_arboles = self._bosque.predecir_arboles(X)
+            notas = predicciones_arboles.mean(axis=1)
+            stds = predicciones_arboles.std(axis=1)
+            
+            respuestas = PrediccionSerializer.create_responses(notas, stds)
+            
+            logger.info(f"Predicción por lotes realizada: {len(respuestas)} estudiantes")
+            return respuestas
+            
+        except Exception as e:
+            logger.error(f"Error en predicción por lotes: {e}")
+            raise ValueError(f"Error realizando predicción: {str(e)}")
+    
+    def _evaluar_bosque(self, version_modelo: int, clave: bytes) -> Tuple[float, float]:
+        """
+        Evalúa todos los árboles del bosque para un vector de características
+        
+        Args:
+            version_modelo: Versión del bosque (solo forma parte de la clave de la caché)
+            clave: Bytes de las características float32 en el orden de FEATURE_COLUMNS
+            
+        Returns:
+            Tuple[float, float]: Media y desviación estándar de los árboles
+        """
+        x = np.frombuffer(clave, dtype=np.float32)
+        
+        # La predicción del bosque es la media de sus árboles;
+        # la confianza se calcula con su desviación estándar
+        return self._bosque.media_std_muestra(x)
+    
     def obtener_info_modelo(self) -> Dict[str, Any]:
         """
         Obtiene información del modelo actual
@@ -221,6 +450,8 @@ class DatasetService:
         Returns:
             Dict: Información del dataset
         """
+        global _dataset_cache
+        
         try:
             if not DATASET_PATH.exists():
                 return {
@@ -228,11 +459,16 @@ class DatasetService:
                     "mensaje": f"Dataset no encontrado en {DATASET_PATH}"
                 }
             
+            # Reutilizar el resultado mientras el archivo no cambie
+            st = DATASET_PATH.stat()
+            if _dataset_cache and _dataset_cache[:2] == (st.st_mtime_ns, st.st_size):
+                return _dataset_cache[2]
+            
             df = pd.read_csv(DATASET_PATH)
             DatasetSerializer.validar_columnas(df)
             df_clean = DatasetSerializer.limpiar_datos(df)
             
-            return {
+            info = {
                 "existe": True,
                 "filas_total": len(df),
                 "filas_validas": len(df_clean),
@@ -240,6 +476,8 @@ class DatasetService:
                 "columnas_requeridas": FEATURE_COLUMNS + [TARGET_COLUMN],
                 "archivo": str(DATASET_PATH)
             }
+            _dataset_cache = (st.st_mtime_ns, st.st_size, info)
+            return info
             
         except Exception as e:
             return {
@@ -35,7 +35,8 @@ MODEL_CONFIG = {
     'max_depth': 10,
     'min_samples_split': 5,
     'min_samples_leaf': 2,
-    'random_state': 42
+    'random_state': 42,
+    'n_jobs': -1  # Entrenar los árboles en paralelo con todos los núcleos
 }
 
 # Classification thresholds
@@ -46,6 +47,18 @@ THRESHOLD_HIGH = 85.0
 CONFIDENCE_HIGH_THRESHOLD = 5.0
 CONFIDENCE_MEDIUM_THRESHOLD = 10.0
 
+# Umbrales ordenados y etiquetas para clasificar con bisect/searchsorted
+NOTA_THRESHOLDS = (THRESHOLD_LOW, THRESHOLD_HIGH)
+NOTA_LABELS = ("bajo", "medio", "alto")
+CONFIANZA_THRESHOLDS = (CONFIDENCE_HIGH_THRESHOLD, CONFIDENCE_MEDIUM_THRESHOLD)
+CONFIANZA_LABELS = ("alto", "medio", "bajo")
+
+# Máximo de estudiantes por petición de predicción por lotes
+BATCH_MAX_SIZE = 100
+
+# Prediction cache (clave: versión del modelo + características exactas)
+PREDICTION_CACHE_SIZE = 4096
+
 # Feature columns
 FEATURE_COLUMNS = [
     'prom_tareas_t1', 'prom_examenes_t1', 'prom_part_t1', 'asistencia_t1',
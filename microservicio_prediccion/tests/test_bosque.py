@@ -0,0 +1,63 @@
+"""
+Tests de BosqueCompilado frente a la inferencia árbol por árbol de sklearn
+"""
+
+import numpy as np
+from django.test import SimpleTestCase
+from sklearn.ensemble import RandomForestRegressor
+
+from microservicio_prediccion.services import BosqueCompilado, _media_std, _recorrer_muestra
+
+
+class BosqueCompiladoTests(SimpleTestCase):
+    """El recorrido aplanado debe reproducir exactamente cada árbol de sklearn"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        rng = np.random.default_rng(0)
+        X_train = rng.uniform(0, 100, (200, 8)).astype(np.float32)
+        y_train = X_train[:, :4].mean(axis=1) + rng.normal(0, 5, 200)
+        cls.modelo = RandomForestRegressor(
+            n_estimators=15, max_depth=6, random_state=0
+        ).fit(X_train, y_train)
+        cls.bosque = BosqueCompilado(cls.modelo)
+
+        # Muestras nuevas más algunas justo sobre el umbral de la raíz (empates <=)
+        X = rng.uniform(0, 100, (60, 8)).astype(np.float32)
+        raiz = cls.modelo.estimators_[0].tree_
+        X[:5, raiz.feature[0]] = np.float32(raiz.threshold[0])
+        cls.X = X
+
+        # (n_arboles, n_muestras)
+        cls.esperado = np.stack([arbol.predict(X) for arbol in cls.modelo.estimators_])
+
+    def test_predecir_arboles_coincide_con_sklearn(self):
+        np.testing.assert_array_equal(self.bosque.predecir_arboles(self.X), self.esperado.T)
+
+    def test_predecir_muestra_coincide_con_sklearn(self):
+        for i, x in enumerate(self.X):
+            np.testing.assert_array_equal(self.bosque.predecir_muestra(x), self.esperado[:, i])
+
+    def test_media_std_muestra_coincide_con_sklearn(self):
+        for i, x in enumerate(self.X):
+            media, std = self.bosque.media_std_muestra(x)
+            self.assertAlmostEqual(media, self.esperado[:, i].mean(), places=9)
+            self.assertAlmostEqual(std, self.esperado[:, i].std(), places=9)
+
+    def test_media_del_bosque_coincide_con_predict(self):
+        np.testing.assert_allclose(
+            self.bosque.predecir_arboles(self.X).mean(axis=1), self.modelo.predict(self.X)
+        )
+
+    def test_versiones_sin_numba_coinciden_con_sklearn(self):
+        b = self.bosque
+        for i, x in enumerate(self.X):
+            esperado = (self.esperado[:, i].mean(), self.esperado[:, i].std())
+            recorrido = _recorrer_muestra(
+                x, b.raices, b.feature, b.umbral, b.izquierdo, b.derecho, b.valor
+            )
+            np.testing.assert_allclose(recorrido, esperado, rtol=0, atol=1e-9)
+            np.testing.assert_allclose(
+                _media_std(b.predecir_muestra(x)), esperado, rtol=0, atol=1e-9
+            )
@@ -0,0 +1,76 @@
+"""
+Tests del endpoint de predicción por lotes
+"""
+
+import json
+
+from django.test import SimpleTestCase
+
+from microservicio_prediccion.settings import BATCH_MAX_SIZE
+
+
+ESTUDIANTE = {
+    "prom_tareas_t1": 85.0,
+    "prom_examenes_t1": 78.0,
+    "prom_part_t1": 92.0,
+    "asistencia_t1": 95.0,
+    "prom_tareas_t2": 87.0,
+    "prom_examenes_t2": 82.0,
+    "prom_part_t2": 88.0,
+    "asistencia_t2": 93.0
+}
+
+
+class BatchPrediccionViewTests(SimpleTestCase):
+    """/predecir/lote/ debe responder igual que /predecir/ para cada estudiante"""
+
+    URL = "/api/v1/predecir/lote/"
+
+    def _post(self, url, datos):
+        return self.client.post(url, json.dumps(datos), content_type="application/json")
+
+    def test_respeta_el_orden_y_coincide_con_prediccion_individual(self):
+        estudiantes = [
+            ESTUDIANTE,
+            dict(ESTUDIANTE, prom_examenes_t2=40.0, prom_tareas_t2=35.5),
+            dict(ESTUDIANTE, prom_tareas_t1=20.0, prom_examenes_t1=30.0, asistencia_t1=50.0),
+        ]
+        respuesta = self._post(self.URL, {"estudiantes": estudiantes})
+        self.assertEqual(respuesta.status_code, 200)
+
+        predicciones = respuesta.json()["predicciones"]
+        self.assertEqual(len(predicciones), len(estudiantes))
+        for estudiante, prediccion in zip(estudiantes, predicciones):
+            individual = self._post("/api/v1/predecir/", estudiante)
+            self.assertEqual(individual.status_code, 200)
+            self.assertEqual(prediccion, individual.json())
+
+    def test_lote_vacio_devuelve_400(self):
+        respuesta = self._post(self.URL, {"estudiantes": []})
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("error", respuesta.json())
+
+    def test_lote_demasiado_grande_devuelve_400(self):
+        respuesta = self._post(self.URL, {"estudiantes": [ESTUDIANTE] * (BATCH_MAX_SIZE + 1)})
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("error", respuesta.json())
+
+    def test_lote_maximo_se_acepta(self):
+        respuesta = self._post(self.URL, {"estudiantes": [ESTUDIANTE] * BATCH_MAX_SIZE})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(respuesta.json()["predicciones"]), BATCH_MAX_SIZE)
+
+    def test_datos_invalidos_devuelven_400(self):
+        for cuerpo in (
+            {"estudiantes": [ESTUDIANTE, dict(ESTUDIANTE, asistencia_t2=150)]},
+            {"estudiantes": [dict(ESTUDIANTE, prom_part_t1="abc")]},
+            {"alumnos": [ESTUDIANTE]},
+        ):
+            with self.subTest(cuerpo=cuerpo):
+                respuesta = self._post(self.URL, cuerpo)
+                self.assertEqual(respuesta.status_code, 400)
+                self.assertIn("error", respuesta.json())
+
+    def test_json_malformado_devuelve_400(self):
+        respuesta = self.client.post(self.URL, b"{no es json", content_type="application/json")
+        self.assertEqual(respuesta.status_code, 400)
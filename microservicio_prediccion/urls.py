@@ -11,6 +11,7 @@ app_name = 'microservicio_prediccion'
 urlpatterns = [
     # 🎯 Predicción de notas académicas
     path('predecir/', views.PrediccionView.as_view(), name='predecir'),
+    path('predecir/lote/', views.BatchPrediccionView.as_view(), name='predecir_lote'),
     
     # 🤖 Gestión del modelo ML
     path('modelo/info/', views.ModeloView.as_view(), name='modelo_info'),
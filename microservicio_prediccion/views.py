@@ -2,21 +2,75 @@
 Views - API Views usando Django REST Framework
 """
 
+from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
 import logging
+import orjson
+from typing import Any, Callable, Dict
 
 from .services import modelo_service, DatasetService
 from .serializers import EstudianteSerializer, PrediccionSerializer
-from .models import EstudianteRequest
+from .models import EstudianteRequest, LotePrediccionRequest
+from .settings import BATCH_MAX_SIZE
 
 logger = logging.getLogger(__name__)
 
+def _json_response(data, status_code: int) -> HttpResponse:
+    """Respuesta JSON serializada con orjson, sin el renderer de DRF"""
+    return HttpResponse(
+        orjson.dumps(data),
+        status=status_code,
+        content_type='application/json'
+    )
+
 
-class PrediccionView(APIView):
+class _PrediccionBaseView(APIView):
+    """
+    Base de las vistas de predicción
+    
+    El cuerpo se valida directamente desde JSON y la respuesta se serializa
+    con orjson, así que se omiten autenticación, parsers y renderers de DRF.
+    """
+    
+    authentication_classes = []
+    permission_classes = []
+    parser_classes = []
+    renderer_classes = [JSONRenderer]
+    
+    def _responder(self, request, predecir: Callable[[bytes], Dict[str, Any]]) -> HttpResponse:
+        """
+        Ejecuta una predicción y traduce sus errores a respuestas HTTP
+        
+        Args:
+            request: Petición con el cuerpo JSON crudo
+            predecir: Función que recibe el cuerpo y devuelve los datos de respuesta
+            
+        Returns:
+            HttpResponse: 200 con los datos, 400 si la entrada es inválida o 500
+        """
+        try:
+            return _json_response(predecir(request.body), status.HTTP_200_OK)
+            
+        except ValueError as e:
+            logger.error(f"Error de validación: {e}")
+            return _json_response(
+                {"error": str(e)}, 
+                status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logger.error(f"Error interno: {e}")
+            return _json_response(
+                {"error": "Error interno del servidor"}, 
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class PrediccionView(_PrediccionBaseView):
     """
     API View para predicción de notas académicas
     """
@@ -65,37 +119,74 @@ class PrediccionView(APIView):
     )
     def post(self, request):
         """Predice la nota del 3er trimestre basada en T1 y T2"""
-        try:
-            # Validar datos de entrada
-            estudiante = EstudianteSerializer.validar_entrada(request.data)
-            
-            # Realizar predicción
-            prediccion = modelo_service.predecir(estudiante)
-            
-            # Serializar respuesta
-            response_data = {
-                "nota_estimada": prediccion.nota_estimada,
-                "clasificacion": prediccion.clasificacion,
-                "nivel_confianza": prediccion.nivel_confianza,
-                "confianza_valor": prediccion.confianza_valor,
-                "mensaje": prediccion.mensaje
-            }
-            
-            logger.info(f"Predicción exitosa: {prediccion.nota_estimada}")
-            return Response(response_data, status=status.HTTP_200_OK)
-            
-        except ValueError as e:
-            logger.error(f"Error de validación: {e}")
-            return Response(
-                {"error": str(e)}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        except Exception as e:
-            logger.error(f"Error interno: {e}")
-            return Response(
-                {"error": "Error interno del servidor"}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        return self._responder(request, self._predecir)
+    
+    @staticmethod
+    def _predecir(cuerpo: bytes) -> Dict[str, Any]:
+        # Validar datos de entrada desde el cuerpo JSON crudo
+        estudiante = EstudianteSerializer.validar_json(cuerpo)
+        
+        # Realizar predicción
+        prediccion = modelo_service.predecir(estudiante)
+        
+        logger.info(f"Predicción exitosa: {prediccion.nota_estimada}")
+        return prediccion.model_dump()
+
+
+class BatchPrediccionView(_PrediccionBaseView):
+    """
+    API View para predicción de notas académicas por lotes
+    
+    Evalúa todos los estudiantes del lote en una sola pasada por el bosque.
+    """
+    
+    @extend_schema(
+        operation_id='predecir_nota_lote',
+        summary='📚 Predecir Notas por Lotes',
+        description=f"""
+        **Predice la nota del tercer trimestre para varios estudiantes** en una sola petición.
+        
+        Acepta hasta {BATCH_MAX_SIZE} estudiantes con los mismos campos que `/predecir/`
+        y devuelve las predicciones en el mismo orden.
+        """,
+        tags=['Predicción'],
+        request={'application/json': LotePrediccionRequest},
+        examples=[
+            OpenApiExample(
+                'Lote Ejemplo',
+                value={
+                    "estudiantes": [
+                        {
+                            "prom_tareas_t1": 85.0,
+                            "prom_examenes_t1": 78.0,
+                            "prom_part_t1": 92.0,
+                            "asistencia_t1": 95.0,
+                            "prom_tareas_t2": 87.0,
+                            "prom_examenes_t2": 82.0,
+                            "prom_part_t2": 88.0,
+                            "asistencia_t2": 93.0
+                        }
+                    ]
+                }
             )
+        ]
+    )
+    def post(self, request):
+        """Predice la nota del 3er trimestre para un lote de estudiantes"""
+        return self._responder(request, self._predecir)
+    
+    @staticmethod
+    def _predecir(cuerpo: bytes) -> Dict[str, Any]:
+        # Validar lote desde el cuerpo JSON crudo
+        estudiantes = EstudianteSerializer.validar_lote_json(cuerpo)
+        
+        # Realizar predicciones
+        predicciones = modelo_service.predecir_batch(estudiantes)
+        
+        logger.info(f"Predicción por lotes exitosa: {len(predicciones)} estudiantes")
+        return {
+            "predicciones": [prediccion.model_dump() for prediccion in predicciones]
+        }
 
 
 class ModeloView(APIView):
@@ -186,6 +277,7 @@ class HealthView(APIView):
                 },
                 "endpoints": [
                     "/api/v1/predecir/",
+                    "/api/v1/predecir/lote/",
                     "/api/v1/modelo/info/",
                     "/api/v1/modelo/entrenar/",
                     "/api/v1/health/"